@@ -1,18 +1,11 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-import numpy as np
 
-# Page config
-st.set_page_config(
-    page_title="MSBA 325 Trade Analysis",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Institution size categories, in display order
+INSTITUTION_SIZES = ['Small Institutions', 'Medium Institutions', 'Large Institutions']
 
-# CSS for compact layout
-st.markdown("""
+# Page styling, kept as a module constant so each rerun reuses the same string
+PAGE_CSS = """
 <style>
     .main .block-container {
         padding-top: 0.5rem;
@@ -44,35 +37,191 @@ st.markdown("""
     .stMarkdown {
         margin-bottom: 0.1rem;
     }
+    .metric-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(9rem, 1fr));  /* Wraps to fewer columns on narrow screens */
+        gap: 1rem;
+        text-align: center;
+    }
+    .metric-label {
+        font-size: 0.875rem;
+        color: #555;
+    }
+    .metric-value {
+        font-size: 1.75rem;
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Static narrative blocks - identical on every rerun, so they are built once at import
+REGIONAL_STRUCTURE_MD = """
+**Lebanese Regional Economic Structure:**
+
+- **Bekaa** - Agricultural and commercial hub with 9,230 institutions
+- **Mount Lebanon** - Largest economic center with 13,240 institutions
+- **North Lebanon** - Industrial and trade region with 8,460 institutions
+- **South Lebanon** - Coastal commercial area with 6,720 institutions
+- **Nabatieh** - Southern agricultural region with 4,586 institutions
+"""
+
+ACTIVITY_PATTERNS_MD = """
+**Regional & National Activity Patterns:**
+
+- **Self Employment** - Most widespread across all regions (722 towns)
+- **Commerce Activities** - Strong in Mount Lebanon and Bekaa (493 towns)
+- **Public Sector** - Present in all regional centers (207 towns)
+- **Service Institutions** - Concentrated in urban areas (126 towns)
+- **Banking Access** - Limited coverage, highest in Mount Lebanon (91 towns)
+"""
+
+ECONOMIC_INSIGHTS_MD = """
+**Economic Structure Insights:**
+
+- Lebanon's economy heavily depends on small businesses (92% of institutions)
+- Mount Lebanon serves as the dominant economic hub (31% of institutions)
+- Regional specialization reflects geographic advantages
+- Banking access remains concentrated in major centers
+"""
+
+STRATEGIC_IMPLICATIONS_MD = """
+**Strategic Implications:**
+
+- Economic development varies significantly by region
+- Small business support is crucial for national economy
+- Infrastructure investment needed in underserved regions
+- Financial services expansion could drive growth
+"""
+
+INTERACTIVE_FEATURES_MD = """
+The **Regional Analysis Filter** allows users to focus on specific governorates and compare their economic structures, 
+while the **Institution Size Filter** lets users analyze patterns across small, medium, and large businesses. 
+When combined, they provide detailed insights into both geography and scale.
+"""
+
+REGION_FILTER_MD = """
+**Regional Analysis Filter**
+
+- Select specific Lebanese governorates for targeted analysis
+- Compare economic patterns across different regions
+- Understand regional specialization and development levels
+"""
+
+SIZE_FILTER_MD = """
+**Institution Size Filter**
+
+- Focus on small, medium, or large business categories
+- Analyze business scale distribution patterns
+- Combined with regional filter for detailed insights
+"""
+
+NATIONAL_ACTIVITY_MD = """
+**🇱🇧 National Activity Analysis:**
+
+- Complete coverage with 1,639 town-activity combinations across Lebanon
+- Self employment dominance with 44% of all combinations
+- Commerce concentration in major economic centers
+- Service distribution varies by regional development level
+"""
+
+# Region narrative shown under the structure list, keyed by sidebar selection
+REGION_NARRATIVES = {
+    'Mount Lebanon': """
+**🗺️ Mount Lebanon Regional Analysis:**
+
+- Lebanon's economic powerhouse containing Beirut and major commercial centers
+- Highest concentration of medium and large institutions (1,040 total)
+- Dominant in financial and service sectors
+- Key driver of national economic activity
+""",
+    'Bekaa': """
+**🗺️ Bekaa Valley Regional Analysis:**
+
+- Agricultural heartland with strong commercial activities
+- Mix of agricultural businesses and trading institutions
+- Strong self-employment and commerce presence
+- Important food production and distribution hub
+""",
+    'North Lebanon': """
+**🗺️ North Lebanon Regional Analysis:**
+
+- Industrial region including Tripoli port city
+- Strong manufacturing and service sector presence
+- Significant commercial and trade activities
+- Strategic location for regional commerce
+""",
+    'South Lebanon': """
+**🗺️ South Lebanon Regional Analysis:**
+
+- Coastal region with port-based trade activities
+- Tourism-related businesses and services
+- Agricultural and fishing industries
+- Cross-border trade significance
+""",
+    'Nabatieh': """
+**🗺️ Nabatieh Regional Analysis:**
+
+- Predominantly agricultural region
+- Growing commercial and service sectors
+- Smallest but developing economic base
+- Traditional and modern business mix
+""",
+    'All Regions': """
+**🇱🇧 National Economic Overview:**
+
+- Analysis across all five Lebanese governorates shows economic diversity
+- Mount Lebanon contains the largest share of commercial institutions
+- Over nine in ten institutions are small-scale enterprises, shaping Lebanon's economic structure
+- Regional specialization varies significantly across governorates
+""",
+}
+
+# Page config
+st.set_page_config(
+    page_title="MSBA 325 Trade Analysis",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# CSS for compact layout - st.html injects the raw <style> without a Markdown pass;
+# a style-only body goes to the event container, so it takes no layout space (1.45+)
+st.html(PAGE_CSS)
 
 # Title
 st.markdown("# Lebanon Trade Sector Analysis")
 
-# Load and process trade data
-@st.cache_data
+# Load and process trade data - built once per process and shared by reference
+# (st.cache_resource skips cache_data's pickle round-trip; callers never mutate it)
+# cache_resource has no disk persistence, so each new process rebuilds it - a
+# few milliseconds for these tables
+@st.cache_resource(show_spinner=False)
 def load_trade_data():
+    # pandas/numpy are only needed to build the cached views, so they load on
+    # the first cache miss, after the CSS and title have been sent
+    import pandas as pd
+    import numpy as np
+    
+    # Region and activity categories in source order - label columns are built
+    # straight from integer codes instead of repeated string lists
+    region_names = ['Bekaa', 'Mount Lebanon', 'North Lebanon', 'South Lebanon', 'Nabatieh']
+    activity_types = ['Self Employment', 'Commerce', 'Public Sector', 'Service Institutions', 'Banking']
     
     # Regional business size distribution with location data
     regional_size_data = pd.DataFrame({
-        'Region': ['Bekaa', 'Bekaa', 'Bekaa', 'Mount Lebanon', 'Mount Lebanon', 'Mount Lebanon', 
-                   'North Lebanon', 'North Lebanon', 'North Lebanon', 'South Lebanon', 'South Lebanon', 'South Lebanon',
-                   'Nabatieh', 'Nabatieh', 'Nabatieh'],
-        'Institution Size': ['Small Institutions', 'Medium Institutions', 'Large Institutions'] * 5,
-        'Count': [8500, 580, 150,  # Bekaa
-                 12200, 820, 220,  # Mount Lebanon  
-                 7800, 520, 140,   # North Lebanon
-                 6200, 410, 110,   # South Lebanon
-                 4240, 282, 64]    # Nabatieh
+        'Region': pd.Categorical.from_codes(np.repeat(np.arange(5), 3), categories=region_names),
+        'Institution Size': pd.Categorical.from_codes(np.tile(np.arange(3), 5), categories=INSTITUTION_SIZES),
+        'Count': np.array([8500, 580, 150,  # Bekaa
+                           12200, 820, 220,  # Mount Lebanon  
+                           7800, 520, 140,   # North Lebanon
+                           6200, 410, 110,   # South Lebanon
+                           4240, 282, 64],   # Nabatieh
+                          dtype=np.int32)
     })
     
     # Regional economic activity presence with location data
     regional_activity_data = pd.DataFrame({
-        'Region': ['Bekaa', 'Mount Lebanon', 'North Lebanon', 'South Lebanon', 'Nabatieh'] * 5,
-        'Activity Type': ['Self Employment'] * 5 + ['Commerce'] * 5 + ['Public Sector'] * 5 + 
-                        ['Service Institutions'] * 5 + ['Banking'] * 5,
-        'Towns with Activity': [
+        'Region': pd.Categorical.from_codes(np.tile(np.arange(5), 5), categories=region_names),
+        'Activity Type': pd.Categorical.from_codes(np.repeat(np.arange(5), 5), categories=activity_types),
+        'Towns with Activity': np.array([
             # Self Employment by region
             165, 220, 142, 118, 77,
             # Commerce by region  
@@ -83,152 +232,288 @@ def load_trade_data():
             32, 41, 26, 18, 9,
             # Banking by region
             22, 28, 18, 15, 8
-        ]
+        ], dtype=np.int32)
     })
     
-    # Fixed totals calculation
-    total_small = 8500 + 12200 + 7800 + 6200 + 4240  # 38,940
-    total_medium = 580 + 820 + 520 + 410 + 282       # 2,612  
-    total_large = 150 + 220 + 140 + 110 + 64         # 684
-    total_institutions = total_small + total_medium + total_large  # 42,236
+    # Totals from axis reductions over the (region x size) and (activity x region)
+    # count blocks - by size, by region and overall
+    size_counts = regional_size_data['Count'].to_numpy().reshape(len(region_names), len(INSTITUTION_SIZES))
+    activity_counts = regional_activity_data['Towns with Activity'].to_numpy().reshape(len(activity_types), len(region_names))
+    total_small, total_medium, total_large = (int(total) for total in size_counts.sum(axis=0))  # 38,940 / 2,612 / 684
+    total_institutions = int(size_counts.sum())  # 42,236
     
-    return regional_size_data, regional_activity_data, {
-        'total_small': total_small,
-        'total_medium': total_medium,
-        'total_large': total_large,
-        'total_institutions': total_institutions,
-        'total_service': 1086,
-        'total_financial': 682,
-        'total_towns': 1137
+    # Sidebar region options, computed once instead of on every rerun
+    regions = sorted(regional_size_data['Region'].unique().tolist())
+    all_regions = ['All Regions'] + regions
+    
+    # Per-region slices the views below are built from - local to the loader.
+    # 'All Regions' holds the national roll-up by institution size
+    size_by_region = {
+        'All Regions': regional_size_data.groupby('Institution Size', sort=False, observed=True)['Count'].sum().reset_index()
     }
+    activity_by_region = {'All Regions': regional_activity_data}
+    size_scope = {'All Regions': 'across all Lebanese regions'}
+    for region in regions:
+        size_by_region[region] = regional_size_data[regional_size_data['Region'] == region]
+        activity_by_region[region] = regional_activity_data[regional_activity_data['Region'] == region]
+        size_scope[region] = f"in {region}"
+    
+    # Everything the page reads per filter state, so each filter is a dict lookup
+    views = {'activity_subtitle': {'All Regions': 'Economic activities across all Lebanese towns'}}
+    for region in regions:
+        views['activity_subtitle'][region] = f"Economic activities across {region} towns"
+    
+    # Per-region totals across all sizes and activities
+    views['size_total'] = {'All Regions': total_institutions}
+    views['size_total'].update(zip(region_names, size_counts.sum(axis=1).tolist()))
+    views['activity_total'] = {'All Regions': int(activity_counts.sum())}
+    views['activity_total'].update(zip(region_names, activity_counts.sum(axis=0).tolist()))
+    
+    # Pie series as plain (labels, values) lists for every size selection mask
+    # (bit i = INSTITUTION_SIZES[i]) within each region slice, so the size filter
+    # never touches pandas on rerun, plus the pie's subtitle, centre annotation
+    # and insight box for each of those selections. Sizes are always listed in
+    # INSTITUTION_SIZES order
+    views['size_slices'] = {}
+    views['size_subtitle'] = {}
+    views['size_annotation'] = {}
+    views['size_message'] = {}
+    for region, size_data in size_by_region.items():
+        size_labels = size_data['Institution Size'].tolist()
+        counts = size_data['Count'].tolist()
+        views['size_slices'][region] = []
+        views['size_subtitle'][region] = []
+        views['size_annotation'][region] = []
+        views['size_message'][region] = []
+        for size_mask in range(1 << len(INSTITUTION_SIZES)):
+            rows = [row for row, size in enumerate(size_labels) if size_mask >> INSTITUTION_SIZES.index(size) & 1]
+            views['size_slices'][region].append(([size_labels[row] for row in rows], [counts[row] for row in rows]))
+            total = sum(counts[row] for row in rows)
+            sizes = [size for bit, size in enumerate(INSTITUTION_SIZES) if size_mask >> bit & 1]
+            if len(sizes) < len(INSTITUTION_SIZES):
+                message = ('info', f"🏢 Showing {', '.join(sizes)} only: {total:,} institutions")
+            elif region != 'All Regions':
+                message = ('info', f"🗺️ Regional Focus: {region} has {total:,} total institutions")
+            else:
+                message = ('success', f"🇱🇧 National Overview: {total:,} institutions across all Lebanese regions")
+            if sizes and len(sizes) < len(INSTITUTION_SIZES):
+                subtitle = f"{' + '.join(sizes)} {size_scope[region]}"
+            else:
+                subtitle = f"Institution distribution {size_scope[region]}"
+            views['size_subtitle'][region].append(subtitle)
+            views['size_annotation'][region].append(f"Total<br>{total:,}")
+            views['size_message'][region].append(message)
+    
+    # Activity bar series as plain (labels, values) lists per region - the
+    # national view is summed by activity type and sorted here, once
+    views['activity_bars'] = {}
+    for region, activity_data in activity_by_region.items():
+        if region == 'All Regions':
+            activity_data = activity_data.groupby('Activity Type', sort=False, observed=True)['Towns with Activity'].sum().reset_index()
+            activity_data = activity_data.sort_values('Towns with Activity', ascending=True)
+        views['activity_bars'][region] = (activity_data['Activity Type'].tolist(), activity_data['Towns with Activity'].tolist())
+    
+    # Towns per activity type for each region's expander activity analysis, in
+    # source order (the national analysis is static text)
+    activity_detail = {
+        region: activity_by_region[region].groupby('Activity Type', sort=False, observed=True)['Towns with Activity'].sum().to_dict()
+        for region in regions
+    }
+    
+    # Activity analysis bullets for the expander, joined into one markdown
+    # string per region; the national overview is static text
+    views['activity_analysis'] = {'All Regions': NATIONAL_ACTIVITY_MD}
+    for region in regions:
+        region_activities_detail = activity_detail[region]
+        bullets = [f"- **{activity}** - {count} towns with activity" for activity, count in region_activities_detail.items()]
+        bullets.append(f"- **Total Coverage** - {sum(region_activities_detail.values())} town-activity combinations")
+        views['activity_analysis'][region] = f"**🗺️ {region} Activity Analysis:**\n\n" + "\n".join(bullets)
+    
+    # Insight box under the activity chart for each region
+    views['activity_message'] = {}
+    for region, total in views['activity_total'].items():
+        if region != 'All Regions':
+            message = ('info', f"🗺️ Regional Focus: {region} activities span {total} town-activity combinations")
+        else:
+            message = ('success', f"🇱🇧 National Overview: {total} town-activity combinations across Lebanon")
+        views['activity_message'][region] = message
+    
+    # Service, financial and town counts from the source report
+    total_service, total_financial, total_towns = 1086, 682, 1137
+    
+    # Key metrics row as (label, preformatted value) pairs
+    metric_cards = [
+        ("Total Commercial Institutions", f"{total_institutions:,}"),
+        ("Small Businesses", f"{total_small:,}"),
+        ("Service Institutions", f"{total_service:,}"),
+        ("Financial Institutions", f"{total_financial:,}"),
+        ("Towns Analyzed", f"{total_towns:,}")
+    ]
+    
+    # Rendered once as a single grid row (styled by .metric-grid in PAGE_CSS) -
+    # one element per rerun instead of five columns each holding a metric
+    metrics_html = (
+        "<div class='metric-grid'>"
+        + "".join(
+            f"<div><div class='metric-label'>{label}</div>"
+            f"<div class='metric-value'>{value}</div></div>"
+            for label, value in metric_cards
+        )
+        + "</div>"
+    )
+    
+    return all_regions, views, metrics_html
 
-# Load the data
-regional_size_data, regional_activity_data, metrics = load_trade_data()
+# Shared, read-only data - a cache_resource hit on every rerun after the first
+all_regions, views, metrics_html = load_trade_data()
 
 # INTERACTIVE FEATURES - Sidebar Controls
 st.sidebar.header("🎛️ Interactive Controls")
-st.sidebar.markdown("*Select filters to analyze Lebanese trade data*")
-
-# Interactive Feature 1: Region Filter (PRIMARY FILTER - impacts both visualizations)
-st.sidebar.subheader("🗺️ Regional Analysis Filter")
-all_regions = ['All Regions'] + sorted(regional_size_data['Region'].unique().tolist())
-selected_region = st.sidebar.selectbox(
-    "Select Lebanese Region to Analyze:",
-    options=all_regions,
-    help="This filter impacts both visualizations below"
-)
+st.sidebar.markdown("*Select filters, then press Apply to analyze Lebanese trade data*")
 
-# Interactive Feature 2: Institution Size Filter (SECONDARY FILTER - impacts visualization 1)
-st.sidebar.subheader("🏢 Institution Size Filter")
-institution_sizes = st.sidebar.multiselect(
-    "Select Institution Sizes to Include:",
-    options=['Small Institutions', 'Medium Institutions', 'Large Institutions'],
-    default=['Small Institutions', 'Medium Institutions', 'Large Institutions'],
-    help="Choose which business sizes to include in the analysis"
-)
+# Both filters sit in one form so adjusting region and sizes together costs a
+# single rerun, on Apply, instead of one rerun per widget change
+with st.sidebar.form("analysis_filters"):
+    # Interactive Feature 1: Region Filter (PRIMARY FILTER - impacts both visualizations)
+    st.subheader("🗺️ Regional Analysis Filter")
+    selected_region = st.selectbox(
+        "Select Lebanese Region to Analyze:",
+        options=all_regions,
+        help="This filter impacts both visualizations below"
+    )
+    
+    # Interactive Feature 2: Institution Size Filter (SECONDARY FILTER - impacts visualization 1)
+    st.subheader("🏢 Institution Size Filter")
+    institution_sizes = st.multiselect(
+        "Select Institution Sizes to Include:",
+        options=INSTITUTION_SIZES,
+        default=INSTITUTION_SIZES,
+        help="Choose which business sizes to include in the analysis"
+    )
+    
+    st.form_submit_button("Apply Filters")
+
+# Size selection as a 3-bit mask (bit i = INSTITUTION_SIZES[i]) - a small int
+# cache key that is the same for every ordering of the multiselect
+size_mask = sum(1 << bit for bit, size in enumerate(INSTITUTION_SIZES) if size in institution_sizes)
 
-# Display current filter status
-st.sidebar.markdown("---")
-st.sidebar.markdown("**🎯 Current Analysis Filters:**")
-st.sidebar.write(f"• **Region**: {selected_region}")
-st.sidebar.write(f"• **Institution Sizes**: {', '.join(institution_sizes) if institution_sizes else 'None selected'}")
+# Selected sizes in INSTITUTION_SIZES order, matching the pie's subtitle and
+# insight box whatever order they were picked in
+selected_sizes = [size for bit, size in enumerate(INSTITUTION_SIZES) if size_mask >> bit & 1]
+
+# Display current filter status - one markdown element for the whole block
+filter_status = [
+    "---",
+    "**🎯 Current Analysis Filters:**",
+    f"• **Region**: {selected_region}",
+    f"• **Institution Sizes**: {', '.join(selected_sizes) if selected_sizes else 'None selected'}"
+]
 
 # Show regional info
 if selected_region != 'All Regions':
-    region_institutions = regional_size_data[regional_size_data['Region'] == selected_region]['Count'].sum()
-    region_activities = regional_activity_data[regional_activity_data['Region'] == selected_region]['Towns with Activity'].sum()
-    st.sidebar.write(f"• **Total Institutions**: {region_institutions:,}")
-    st.sidebar.write(f"• **Activity Coverage**: {region_activities} towns")
+    region_institutions = views['size_total'][selected_region]
+    region_activities = views['activity_total'][selected_region]
+    filter_status.append(f"• **Total Institutions**: {region_institutions:,}")
+    filter_status.append(f"• **Activity Coverage**: {region_activities} towns")
 
-# Apply filters based on interactive selections
+st.sidebar.markdown("\n\n".join(filter_status))
 
-# Filter 1: Regional size distribution data (IMPACTS BOTH CHARTS)
-if selected_region != 'All Regions':
-    filtered_size_data = regional_size_data[regional_size_data['Region'] == selected_region]
-    filtered_activity_data = regional_activity_data[regional_activity_data['Region'] == selected_region]
-    chart1_subtitle = f"Institution distribution in {selected_region}"
-    chart2_subtitle = f"Economic activities across {selected_region} towns"
-else:
-    filtered_size_data = regional_size_data.copy()
-    filtered_activity_data = regional_activity_data.copy()
-    chart1_subtitle = "Institution distribution across all Lebanese regions"
-    chart2_subtitle = "Economic activities across all Lebanese towns"
+# Apply filters based on interactive selections
 
+# Filter 1: Regional filter (IMPACTS BOTH CHARTS)
 # Filter 2: Institution size filter (IMPACTS VISUALIZATION 1)
-if institution_sizes:
-    filtered_size_data = filtered_size_data[filtered_size_data['Institution Size'].isin(institution_sizes)]
-    if len(institution_sizes) < 3:
-        size_types = ' + '.join(institution_sizes)
-        if selected_region != 'All Regions':
-            chart1_subtitle = f"{size_types} in {selected_region}"
-        else:
-            chart1_subtitle = f"{size_types} across all Lebanese regions"
-else:
-    # If no institution sizes selected, create empty dataframe
-    filtered_size_data = filtered_size_data.iloc[0:0]
-
-# Calculate totals for the selected filters
-if len(filtered_size_data) > 0:
-    filtered_total_institutions = filtered_size_data['Count'].sum()
-else:
-    filtered_total_institutions = 0
-
-if len(filtered_activity_data) > 0:
-    filtered_total_activities = filtered_activity_data['Towns with Activity'].sum()
-else:
-    filtered_total_activities = 0
+# Both filters are lookups into the (labels, values) series built by the loader;
+# only the values are needed here, for the empty-data guards - an empty size
+# selection (mask 0) leaves an empty list
+_, selected_size_counts = views['size_slices'][selected_region][size_mask]
+_, selected_activity_towns = views['activity_bars'][selected_region]
+
+# Chart subtitles for the selected filters
+chart1_subtitle = views['size_subtitle'][selected_region][size_mask]
+chart2_subtitle = views['activity_subtitle'][selected_region]
+
+# Cached figure builders - one entry per chart and filter state, so changing
+# the size filter only rebuilds the pie. The returned figures are shared
+# across reruns and sessions, so callers must treat them as read-only.
+# max_entries covers the whole filter space (6 regions x 8 size masks for the
+# pie, 6 regions for the bar), so nothing reachable is evicted but new filters
+# can't grow the caches unbounded. No ttl - the data is static
+@st.cache_resource(max_entries=48, show_spinner=False)
+def build_size_figure(region, size_mask):
+    # Selected sizes for the region, or for the national roll-up
+    size_labels, size_counts = views['size_slices'][region][size_mask]
+    
+    # Built directly with graph_objects - px's dataframe preprocessing is
+    # pure overhead for a 3-slice pie
+    fig = go.Figure(go.Pie(
+        labels=size_labels,
+        values=size_counts,
+        hole=0.5,
+        marker_colors=['#FF6B6B', '#4ECDC4', '#45B7D1'],
+        textposition='auto',
+        textinfo='percent+label',
+        textfont_size=14,
+        hovertemplate='Institution Size=%{label}<br>Count=%{value}<extra></extra>'
+    ))
+    fig.update_layout(
+        height=250,
+        template='plotly_white',
+        margin=dict(l=20, r=20, t=20, b=20),
+        uirevision='size_chart',  # Stable across filter changes so user UI state (e.g. hidden slices) is kept
+        annotations=[dict(text=views['size_annotation'][region][size_mask], x=0.5, y=0.5, font_size=14, showarrow=False)]
+    )
+    return fig
+
+@st.cache_resource(max_entries=6, show_spinner=False)
+def build_activity_figure(region):
+    # One go.Bar with a colour per row, fed straight from the loader's lists
+    activity_types, towns = views['activity_bars'][region]
+    fig = go.Figure(go.Bar(
+        x=towns,
+        y=activity_types,
+        orientation='h',
+        marker_color=['#2E8B57', '#4ECDC4', '#FF6B6B', '#45B7D1', '#FFA07A'][:len(towns)],
+        text=towns,
+        textposition='outside',
+        textfont_size=12,
+        texttemplate='%{text}',
+        hovertemplate='Activity Type=%{y}<br>Towns with Activity=%{x}<extra></extra>'
+    ))
+    fig.update_layout(
+        height=250,
+        template='plotly_white',
+        margin=dict(l=120, r=60, t=20, b=30),  # Increased right margin from 40 to 60
+        uirevision='activity_chart',
+        showlegend=False,
+        font=dict(size=11),
+        xaxis_title='Number of Towns with Activity',
+        yaxis_title='',
+        xaxis=dict(showgrid=True, gridcolor='lightgray', range=[0, 800]),  # Set explicit x-axis range
+        yaxis=dict(showgrid=False, autorange='reversed')  # First row on top, as px laid it out
+    )
+    return fig
 
 # Key Metrics Row (CORRECTED TOTALS)
-col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
-with col_m1:
-    st.metric("Total Commercial Institutions", f"{metrics['total_institutions']:,}")
-with col_m2:
-    st.metric("Small Businesses", f"{metrics['total_small']:,}")
-with col_m3:
-    st.metric("Service Institutions", f"{metrics['total_service']:,}")
-with col_m4:
-    st.metric("Financial Institutions", f"{metrics['total_financial']:,}")
-with col_m5:
-    st.metric("Towns Analyzed", f"{metrics['total_towns']:,}")
+st.html(metrics_html)
 
 # Main Interactive Visualizations Section
-st.markdown("---")
-st.markdown("## 🎯 Interactive Trade Data Visualizations")
-st.markdown("*Use the sidebar controls to filter and analyze Lebanese trade data by city*")
+st.markdown("---\n\n"
+            "## 🎯 Interactive Trade Data Visualizations\n\n"
+            "*Use the sidebar controls to filter and analyze Lebanese trade data by city*")
 
 col1, col2 = st.columns(2)
 
 # VISUALIZATION 1: Regional Business Size Distribution (INTERACTIVE - responds to both filters)
 with col1:
-    st.markdown("### 📊 Commercial Institution Size Distribution")
-    st.markdown(f"*{chart1_subtitle}*")
+    st.markdown(f"### 📊 Commercial Institution Size Distribution\n\n*{chart1_subtitle}*")
     
-    if len(filtered_size_data) > 0:
-        # Aggregate data for the selected region(s) and institution sizes
-        if selected_region != 'All Regions':
-            plot_data = filtered_size_data
-        else:
-            # Sum across all regions for national view
-            plot_data = filtered_size_data.groupby('Institution Size')['Count'].sum().reset_index()
-        
-        fig1 = px.pie(plot_data, values='Count', names='Institution Size', hole=0.5,
-                      color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#45B7D1'])
-        fig1.update_traces(textposition='auto', textinfo='percent+label', textfont_size=14)
-        fig1.update_layout(
-            height=250,
-            template='plotly_white',
-            margin=dict(l=20, r=20, t=20, b=20),
-            annotations=[dict(text=f'Total<br>{plot_data["Count"].sum():,}', x=0.5, y=0.5, font_size=14, showarrow=False)]
-        )
+    if len(selected_size_counts) > 0:
+        fig1 = build_size_figure(selected_region, size_mask)
         st.plotly_chart(fig1, use_container_width=True)
         
-        # Show filter-based insights
-        if len(institution_sizes) < 3:
-            st.info(f"🏢 Showing {', '.join(institution_sizes)} only: {filtered_total_institutions:,} institutions")
-        elif selected_region != 'All Regions':
-            st.info(f"🗺️ Regional Focus: {selected_region} has {filtered_total_institutions:,} total institutions")
-        else:
-            st.success(f"🇱🇧 National Overview: {filtered_total_institutions:,} institutions across all Lebanese regions")
+        # Show filter-based insights (precomputed per region and size mask)
+        message_kind, message = views['size_message'][selected_region][size_mask]
+        getattr(st, message_kind)(message)
     else:
         if not institution_sizes:
             st.warning("⚠️ Please select at least one institution size to display data")
@@ -237,162 +522,54 @@ with col1:
 
 # VISUALIZATION 2: Regional Activity Presence (INTERACTIVE - responds to region filter)  
 with col2:
-    st.markdown("### 🏬 Economic Activity Presence Across Towns")
-    st.markdown(f"*{chart2_subtitle}*")
+    st.markdown(f"### 🏬 Economic Activity Presence Across Towns\n\n*{chart2_subtitle}*")
     
-    if len(filtered_activity_data) > 0:
-        # Aggregate data for cleaner visualization
-        if selected_region != 'All Regions':
-            # For single region, show simple bar chart
-            plot_data2 = filtered_activity_data
-            fig2 = px.bar(plot_data2, x='Towns with Activity', y='Activity Type', orientation='h',
-                          color='Activity Type', 
-                          color_discrete_sequence=['#2E8B57', '#4ECDC4', '#FF6B6B', '#45B7D1', '#FFA07A'],
-                          text='Towns with Activity')
-        else:
-            # For all regions, sum by activity type for cleaner view
-            plot_data2 = filtered_activity_data.groupby('Activity Type')['Towns with Activity'].sum().reset_index()
-            plot_data2 = plot_data2.sort_values('Towns with Activity', ascending=True)
-            fig2 = px.bar(plot_data2, x='Towns with Activity', y='Activity Type', orientation='h',
-                          color='Activity Type',
-                          color_discrete_sequence=['#2E8B57', '#4ECDC4', '#FF6B6B', '#45B7D1', '#FFA07A'],
-                          text='Towns with Activity')
-        
-        fig2.update_traces(textposition='outside', textfont_size=12, texttemplate='%{text}')
-        fig2.update_layout(
-            height=250,
-            template='plotly_white',
-            margin=dict(l=120, r=60, t=20, b=30),  # Increased right margin from 40 to 60
-            showlegend=False,
-            font=dict(size=11),
-            xaxis_title='Number of Towns with Activity',
-            yaxis_title='',
-            xaxis=dict(showgrid=True, gridcolor='lightgray', range=[0, 800]),  # Set explicit x-axis range
-            yaxis=dict(showgrid=False)
-        )
+    if len(selected_activity_towns) > 0:
+        fig2 = build_activity_figure(selected_region)
         st.plotly_chart(fig2, use_container_width=True)
         
         # Show regional analysis insight
-        if selected_region != 'All Regions':
-            st.info(f"🗺️ Regional Focus: {selected_region} activities span {filtered_total_activities} town-activity combinations")
-        else:
-            st.success(f"🇱🇧 National Overview: {filtered_total_activities} town-activity combinations across Lebanon")
+        message_kind, message = views['activity_message'][selected_region]
+        getattr(st, message_kind)(message)
     else:
         st.warning("⚠️ No activity data available for selected region")
 
 # Context and Insights Section (STREAMLINED)
-st.markdown("---")
-st.markdown("## 📈 Key Trade Insights")
+st.markdown("---\n\n## 📈 Key Trade Insights")
 
 # Trade insights with clean structure
 with st.expander("🔍 Regional Structure & National Overview", expanded=True):
     col_i1, col_i2 = st.columns(2)
     with col_i1:
-        st.markdown("**Lebanese Regional Economic Structure:**")
-        st.markdown("- **Bekaa** - Agricultural and commercial hub with 9,230 institutions")
-        st.markdown("- **Mount Lebanon** - Largest economic center with 13,240 institutions")
-        st.markdown("- **North Lebanon** - Industrial and trade region with 8,460 institutions")
-        st.markdown("- **South Lebanon** - Coastal commercial area with 6,720 institutions")
-        st.markdown("- **Nabatieh** - Southern agricultural region with 4,586 institutions")
+        st.markdown(REGIONAL_STRUCTURE_MD)
         
         # Dynamic insights based on regional filter (in bullet format)
-        if selected_region == 'Mount Lebanon':
-            st.markdown("**🗺️ Mount Lebanon Regional Analysis:**")
-            st.markdown("- Lebanon's economic powerhouse containing Beirut and major commercial centers")
-            st.markdown("- Highest concentration of medium and large institutions (1,040 total)")
-            st.markdown("- Dominant in financial and service sectors")
-            st.markdown("- Key driver of national economic activity")
-        elif selected_region == 'Bekaa':
-            st.markdown("**🗺️ Bekaa Valley Regional Analysis:**")
-            st.markdown("- Agricultural heartland with strong commercial activities")
-            st.markdown("- Mix of agricultural businesses and trading institutions")
-            st.markdown("- Strong self-employment and commerce presence")
-            st.markdown("- Important food production and distribution hub")
-        elif selected_region == 'North Lebanon':
-            st.markdown("**🗺️ North Lebanon Regional Analysis:**")
-            st.markdown("- Industrial region including Tripoli port city")
-            st.markdown("- Strong manufacturing and service sector presence")
-            st.markdown("- Significant commercial and trade activities")
-            st.markdown("- Strategic location for regional commerce")
-        elif selected_region == 'South Lebanon':
-            st.markdown("**🗺️ South Lebanon Regional Analysis:**")
-            st.markdown("- Coastal region with port-based trade activities")
-            st.markdown("- Tourism-related businesses and services")
-            st.markdown("- Agricultural and fishing industries")
-            st.markdown("- Cross-border trade significance")
-        elif selected_region == 'Nabatieh':
-            st.markdown("**🗺️ Nabatieh Regional Analysis:**")
-            st.markdown("- Predominantly agricultural region")
-            st.markdown("- Growing commercial and service sectors")
-            st.markdown("- Smallest but developing economic base")
-            st.markdown("- Traditional and modern business mix")
-        else:
-            st.markdown("**🇱🇧 National Economic Overview:**")
-            st.markdown("- Analysis across all five Lebanese governorates shows economic diversity")
-            st.markdown("- Mount Lebanon contains the largest share of commercial institutions")
-            st.markdown("- Over nine in ten institutions are small-scale enterprises, shaping Lebanon's economic structure")
-            st.markdown("- Regional specialization varies significantly across governorates")
+        st.markdown(REGION_NARRATIVES[selected_region])
         
     with col_i2:
-        st.markdown("**Regional & National Activity Patterns:**")
-        st.markdown("- **Self Employment** - Most widespread across all regions (722 towns)")
-        st.markdown("- **Commerce Activities** - Strong in Mount Lebanon and Bekaa (493 towns)")
-        st.markdown("- **Public Sector** - Present in all regional centers (207 towns)")
-        st.markdown("- **Service Institutions** - Concentrated in urban areas (126 towns)")
-        st.markdown("- **Banking Access** - Limited coverage, highest in Mount Lebanon (91 towns)")
+        st.markdown(ACTIVITY_PATTERNS_MD)
         
         # Dynamic activity insights based on regional filter (in bullet format)
-        if selected_region != 'All Regions':
-            region_activities_detail = filtered_activity_data.groupby('Activity Type')['Towns with Activity'].sum().to_dict()
-            st.markdown(f"**🗺️ {selected_region} Activity Analysis:**")
-            for activity, count in region_activities_detail.items():
-                st.markdown(f"- **{activity}** - {count} towns with activity")
-            st.markdown(f"- **Total Coverage** - {sum(region_activities_detail.values())} town-activity combinations")
-        else:
-            st.markdown("**🇱🇧 National Activity Analysis:**")
-            st.markdown("- Complete coverage with 1,639 town-activity combinations across Lebanon")
-            st.markdown("- Self employment dominance with 44% of all combinations")
-            st.markdown("- Commerce concentration in major economic centers")
-            st.markdown("- Service distribution varies by regional development level")
-
-st.markdown("---")
-st.markdown("## 📊 Key Economic Insights")
+        st.markdown(views['activity_analysis'][selected_region])
+
+st.markdown("---\n\n## 📊 Key Economic Insights")
 col_insight1, col_insight2 = st.columns(2)
 
 with col_insight1:
-    st.markdown("**Economic Structure Insights:**")
-    st.markdown("- Lebanon's economy heavily depends on small businesses (92% of institutions)")
-    st.markdown("- Mount Lebanon serves as the dominant economic hub (31% of institutions)")
-    st.markdown("- Regional specialization reflects geographic advantages")
-    st.markdown("- Banking access remains concentrated in major centers")
+    st.markdown(ECONOMIC_INSIGHTS_MD)
 
 with col_insight2:
-    st.markdown("**Strategic Implications:**")
-    st.markdown("- Economic development varies significantly by region")
-    st.markdown("- Small business support is crucial for national economy")
-    st.markdown("- Infrastructure investment needed in underserved regions")
-    st.markdown("- Financial services expansion could drive growth")
+    st.markdown(STRATEGIC_IMPLICATIONS_MD)
 
 # Interactive Features Summary
-st.markdown("---")
-st.markdown("## 🎛️ Interactive Features")
+st.markdown("---\n\n## 🎛️ Interactive Features")
 
-st.markdown("""
-The **Regional Analysis Filter** allows users to focus on specific governorates and compare their economic structures, 
-while the **Institution Size Filter** lets users analyze patterns across small, medium, and large businesses. 
-When combined, they provide detailed insights into both geography and scale.
-""")
+st.markdown(INTERACTIVE_FEATURES_MD)
 
 col_s1, col_s2 = st.columns(2)
 
 with col_s1:
-    st.markdown("**Regional Analysis Filter**")
-    st.markdown("- Select specific Lebanese governorates for targeted analysis")
-    st.markdown("- Compare economic patterns across different regions")
-    st.markdown("- Understand regional specialization and development levels")
+    st.markdown(REGION_FILTER_MD)
 
 with col_s2:
-    st.markdown("**Institution Size Filter**")
-    st.markdown("- Focus on small, medium, or large business categories")
-    st.markdown("- Analyze business scale distribution patterns")
-    st.markdown("- Combined with regional filter for detailed insights")
+    st.markdown(SIZE_FILTER_MD)